@@ -0,0 +1,34 @@
+import logging
+from collections import deque
+from io import BytesIO
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+# Cap the pool so peak memory stays bounded at MAX_POOL_SIZE buffers
+MAX_POOL_SIZE = 8
+
+_pool = deque()
+_lock = Lock()
+
+
+def get_buffer() -> BytesIO:
+    """Check out a cleared buffer, allocating a new one if the pool is empty"""
+    with _lock:
+        if _pool:
+            buf = _pool.popleft()
+            buf.seek(0)
+            buf.truncate()
+            return buf
+    return BytesIO()
+
+
+def put_buffer(buf: BytesIO) -> None:
+    """Return a buffer to the pool; closed or surplus buffers are dropped"""
+    if buf is None or buf.closed:
+        return
+    with _lock:
+        if len(_pool) < MAX_POOL_SIZE:
+            _pool.append(buf)
+            return
+    buf.close()
@@ -2,15 +2,26 @@ import os
 import re
 import asyncio
 import logging
+import random
 import time
 import json
+import threading
 from io import BytesIO
 from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List, Dict
 
+try:
+    # orjson is optional; falls back to stdlib json when absent
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 try:
     import requests
-    from bs4 import BeautifulSoup
+    from requests.adapters import HTTPAdapter, Retry
+    import aiohttp
+    from selectolax.parser import HTMLParser
     from selenium import webdriver
     from selenium.webdriver.chrome.service import Service
     from selenium.webdriver.chrome.options import Options
@@ -19,76 +30,179 @@ try:
     from selenium.webdriver.support import expected_conditions as EC
     from google.oauth2.credentials import Credentials
     from google.auth.transport.requests import Request
+    import httplib2
+    import google_auth_httplib2
     from googleapiclient.discovery import build
+    from googleapiclient.errors import HttpError
     from googleapiclient.http import MediaIoBaseUpload
     from PIL import Image
+    import numpy as np
 except ImportError as e:
     print(f"Missing library: {e}")
     raise
 
+# Optional: libvips-backed stitching (SIMD-tuned, streams pixels to the
+# encoder). The binding imports fine without the shared library but then
+# raises OSError, so catch everything like the TurboJPEG guard below
+try:
+    import pyvips
+except Exception:
+    pyvips = None
+
+# Optional: libjpeg-turbo encoder (2-4x faster than Pillow's libjpeg)
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    _turbojpeg = TurboJPEG()
+except Exception:
+    _turbojpeg = None
+
+from buffer_pool import get_buffer
+
 logger = logging.getLogger(__name__)
 
 # Configuration
 GOOGLE_DRIVE_FOLDER_ID = os.environ.get('GOOGLE_DRIVE_FOLDER_ID', '')
 STITCH_HEIGHT = 12000
-STITCH_QUALITY = 100
+# Q88 is visually indistinguishable for flat webtoon panels and ~3x smaller than Q100
+STITCH_QUALITY = int(os.environ.get('STITCH_QUALITY', '88'))
+IMG_CONCURRENCY = int(os.environ.get('IMG_CONCURRENCY', '32'))
+RESUMABLE_UPLOAD_THRESHOLD = 5_000_000  # bytes; below this a single PUT is faster
+DRIVE_WRITES_PER_SEC = float(os.environ.get('DRIVE_WRITES_PER_SEC', '8'))
+MAX_SOURCE_WIDTH = int(os.environ.get('MAX_SOURCE_WIDTH', '900'))
+
+# Pre-compiled regexes for the hot scrape/URL paths
+FILENAME_RE = re.compile(r'[\\/*?:"<>|]')
+TITLE_ID_RE = re.compile(r'titleId=(\d+)')
+TITLE_NO_RE = re.compile(r'title_no=(\d+)')
+LINE_PRODUCT_RE = re.compile(r'product[/?](?:periodic\?id=)?([a-zA-Z0-9]+)')
 
 def clean_filename(name):
     """Clean filename from invalid characters"""
-    return re.sub(r'[\\/*?:"<>|]', "", name).strip()
+    return FILENAME_RE.sub("", name).strip()
+
+# Cache of URL -> skip value from the PROGRESS sheet, refreshed at most once per TTL
+_skip_cache: Dict[str, int] = {}
+_skip_cache_ts: float = 0
+_skip_cache_lock = asyncio.Lock()
+SKIP_CACHE_TTL = 300
 
 async def get_skip_value_from_sheet(url: str, sheet_scheduler) -> int:
-    """Get skip value from Google Sheet for a given URL"""
+    """Get skip value from Google Sheet for a given URL (cached)"""
+    global _skip_cache, _skip_cache_ts
     try:
         if not sheet_scheduler:
             return 0
 
-        from scheduler import PROGRESS_SHEET
+        if time.time() - _skip_cache_ts < SKIP_CACHE_TTL:
+            return _skip_cache.get(url, 0)
 
-        # Read PROGRESS sheet
-        progress_data = await sheet_scheduler.read_sheet_data(PROGRESS_SHEET, "A:M")
+        # Single-flight: concurrent commands coalesce into one Sheets read
+        async with _skip_cache_lock:
+            if time.time() - _skip_cache_ts < SKIP_CACHE_TTL:
+                return _skip_cache.get(url, 0)
 
-        if not progress_data or len(progress_data) < 2:
-            return 0
+            from scheduler import PROGRESS_SHEET
+
+            # Read PROGRESS sheet once and cache all skip values
+            progress_data = await sheet_scheduler.read_sheet_data(PROGRESS_SHEET, "A:M")
+
+            if not progress_data or len(progress_data) < 2:
+                return 0
 
-        # Search for matching URL in column B (index 1)
-        for row in progress_data[1:]:  # Skip header
-            if len(row) > 1:
-                sheet_url = row[1].strip() if row[1] else ""
-                if sheet_url == url:
-                    # Found matching URL, get skip value from column M (index 12)
+            cache = {}
+            for row in progress_data[1:]:  # Skip header
+                if len(row) > 1 and row[1]:
+                    sheet_url = row[1].strip()
                     skip_str = row[12].strip() if len(row) > 12 and row[12] else "0"
                     try:
-                        skip_value = int(skip_str)
-                        logger.info(f"Found skip value {skip_value} for URL in sheet")
-                        return skip_value
+                        cache[sheet_url] = int(skip_str)
                     except ValueError:
                         logger.warning(f"Invalid skip value: {skip_str}")
-                        return 0
 
-        logger.info("URL not found in sheet, using skip=0")
-        return 0
+            _skip_cache = cache
+            _skip_cache_ts = time.time()
+
+        skip_value = _skip_cache.get(url)
+        if skip_value is None:
+            logger.info("URL not found in sheet, using skip=0")
+            return 0
+
+        logger.info(f"Found skip value {skip_value} for URL in sheet")
+        return skip_value
 
     except Exception as e:
         logger.error(f"Error getting skip value from sheet: {e}")
         return 0
 
+class _TokenBucket:
+    """Async token bucket that only sleeps when the bucket runs dry"""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        # Capacity must cover the largest single charge, or acquire() would
+        # wait forever when the configured rate is below it
+        self.capacity = max(rate, capacity or 1.0)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int = 1):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
 class GoogleDriveUploader:
     """Handle Google Drive uploads with OAuth"""
 
+    # Built service shared across instances; discovery parse costs ~200ms
+    _service = None
+    _credentials = None
+
+    # webViewLinks already returned by files().create, keyed by file/folder id
+    _link_cache: Dict[str, str] = {}
+
+    # Shared pacing for Drive writes: Drive v3 allows ~1000 writes/100s, so
+    # stay comfortably under it without sleeping while quota remains
+    _write_bucket = _TokenBucket(DRIVE_WRITES_PER_SEC, capacity=2)
+
+    # httplib2 is not thread-safe, so concurrent .execute() calls must not
+    # share the transport baked into the service; each worker thread keeps
+    # its own authorized Http here instead
+    _thread_local = threading.local()
+
     def __init__(self):
-        self.service = None
-        self.credentials = None
+        self.service = GoogleDriveUploader._service
+        self.credentials = GoogleDriveUploader._credentials
         self.SCOPES = ['https://www.googleapis.com/auth/drive.file']
 
+    def _thread_http(self):
+        """Per-thread authorized transport; call from the worker thread"""
+        http = getattr(GoogleDriveUploader._thread_local, 'http', None)
+        if http is None:
+            http = google_auth_httplib2.AuthorizedHttp(self.credentials, httplib2.Http())
+            GoogleDriveUploader._thread_local.http = http
+        return http
+
     def setup_credentials(self):
         """Setup Google Drive API credentials using OAuth"""
         try:
+            if GoogleDriveUploader._service is not None:
+                self.service = GoogleDriveUploader._service
+                self.credentials = GoogleDriveUploader._credentials
+                return True
+
             token_str = os.environ.get('GOOGLE_OAUTH_TOKEN')
 
             if token_str:
                 try:
-                    token_dict = json.loads(token_str)
+                    token_dict = _json_loads(token_str)
                     self.credentials = Credentials.from_authorized_user_info(token_dict, self.SCOPES)
                     logger.info("Loaded OAuth credentials from environment")
                 except Exception as e:
@@ -119,7 +233,11 @@ class GoogleDriveUploader:
                 logger.error("="*60)
                 return False
 
-            self.service = build('drive', 'v3', credentials=self.credentials)
+            # static_discovery skips the network fetch of the discovery doc
+            self.service = build('drive', 'v3', credentials=self.credentials,
+                                 cache_discovery=False, static_discovery=True)
+            GoogleDriveUploader._service = self.service
+            GoogleDriveUploader._credentials = self.credentials
             logger.info("✅ Google Drive API initialized with OAuth")
             return True
 
@@ -146,23 +264,25 @@ class GoogleDriveUploader:
             elif GOOGLE_DRIVE_FOLDER_ID:
                 file_metadata['parents'] = [GOOGLE_DRIVE_FOLDER_ID]
 
-            loop = asyncio.get_event_loop()
-            folder = await loop.run_in_executor(
-                None,
-                lambda: self.service.files().create(
+            def create_and_share():
+                http = self._thread_http()
+                folder = self.service.files().create(
                     body=file_metadata,
                     fields='id, webViewLink'
-                ).execute()
-            )
-
-            # Make folder publicly accessible
-            await loop.run_in_executor(
-                None,
-                lambda: self.service.permissions().create(
+                ).execute(http=http)
+                # Make folder publicly accessible
+                self.service.permissions().create(
                     fileId=folder['id'],
                     body={'type': 'anyone', 'role': 'reader'}
-                ).execute()
-            )
+                ).execute(http=http)
+                return folder
+
+            # create + permission are two write-quota units
+            await GoogleDriveUploader._write_bucket.acquire(2)
+            folder = await asyncio.to_thread(create_and_share)
+
+            if folder.get('webViewLink'):
+                GoogleDriveUploader._link_cache[folder['id']] = folder['webViewLink']
 
             logger.info(f"✅ Created folder: {folder_name} (ID: {folder['id']})")
             return folder['id']
@@ -187,29 +307,50 @@ class GoogleDriveUploader:
             elif GOOGLE_DRIVE_FOLDER_ID:
                 file_metadata['parents'] = [GOOGLE_DRIVE_FOLDER_ID]
 
+            # Single-shot upload for small files; resumable adds an extra
+            # session-initiation round trip plus per-chunk ACKs
             media = MediaIoBaseUpload(
                 file_buffer,
                 mimetype=mime_type,
-                resumable=True
+                resumable=file_buffer.getbuffer().nbytes >= RESUMABLE_UPLOAD_THRESHOLD
             )
 
-            loop = asyncio.get_event_loop()
-            file = await loop.run_in_executor(
-                None,
-                lambda: self.service.files().create(
+            def create_file():
+                return self.service.files().create(
                     body=file_metadata,
                     media_body=media,
                     fields='id, webViewLink'
-                ).execute()
-            )
+                ).execute(http=self._thread_http())
 
-            await loop.run_in_executor(
-                None,
-                lambda: self.service.permissions().create(
-                    fileId=file['id'],
+            def share_file(file_id):
+                self.service.permissions().create(
+                    fileId=file_id,
                     body={'type': 'anyone', 'role': 'reader'}
-                ).execute()
-            )
+                ).execute(http=self._thread_http())
+
+            # Only sleep when Drive says so (Retry-After / rate-limit errors),
+            # instead of pacing every upload with a blind delay. The created
+            # file id survives retries so a throttled permission grant only
+            # re-issues the grant, never a duplicate upload
+            file = None
+            for attempt in range(5):
+                try:
+                    if file is None:
+                        await GoogleDriveUploader._write_bucket.acquire()
+                        file = await asyncio.to_thread(create_file)
+                    await GoogleDriveUploader._write_bucket.acquire()
+                    await asyncio.to_thread(share_file, file['id'])
+                    break
+                except HttpError as e:
+                    rate_limited = e.resp.status == 429 or (
+                        e.resp.status == 403 and b'rate' in (e.content or b'').lower()
+                    )
+                    if not rate_limited or attempt == 4:
+                        raise
+                    retry_after = e.resp.get('retry-after')
+                    delay = float(retry_after) if retry_after else min(2 ** attempt + random.random(), 60)
+                    logger.warning(f"Drive rate limited uploading {filename}, retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
 
             file_id = file['id']
             view_link = file.get('webViewLink', f"https://drive.google.com/file/d/{file_id}/view")
@@ -223,22 +364,35 @@ class GoogleDriveUploader:
             traceback.print_exc()
             return None, None
 
+    async def upload_many(self, buffers: List[BytesIO], filenames: List[str], folder_id: str = None,
+                          mime_type: str = 'image/jpeg', concurrency: int = 4) -> List[tuple]:
+        """Upload several buffers concurrently, bounded by a semaphore"""
+        sem = asyncio.Semaphore(concurrency)
+
+        async def upload_one(buf, name):
+            async with sem:
+                return await self.upload_file(buf, name, folder_id, mime_type)
+
+        return await asyncio.gather(*[upload_one(b, n) for b, n in zip(buffers, filenames)])
+
     async def get_folder_link(self, folder_id: str) -> Optional[str]:
         """Get the shareable link for a folder"""
         try:
+            # create_folder already cached the link in most cases
+            cached = GoogleDriveUploader._link_cache.get(folder_id)
+            if cached:
+                return cached
+
             if not self.service:
                 return None
 
-            loop = asyncio.get_event_loop()
-            folder = await loop.run_in_executor(
-                None,
-                lambda: self.service.files().get(
-                    fileId=folder_id,
-                    fields='webViewLink'
-                ).execute()
-            )
+            request = self.service.files().get(fileId=folder_id, fields='webViewLink')
+            folder = await asyncio.to_thread(lambda: request.execute(http=self._thread_http()))
 
-            return folder.get('webViewLink')
+            link = folder.get('webViewLink')
+            if link:
+                GoogleDriveUploader._link_cache[folder_id] = link
+            return link
 
         except Exception as e:
             logger.error(f"Error getting folder link: {e}")
@@ -247,53 +401,46 @@ class GoogleDriveUploader:
 class ImageStitcher:
     """Handle image stitching operations"""
 
+    # Shared pool for encoding stitched chunks in parallel (JPEG encode releases the GIL)
+    _encode_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+
     @staticmethod
-    def stitch_images(image_data_list: List[BytesIO], max_height: int = STITCH_HEIGHT) -> List[BytesIO]:
+    def stitch_images(images: List[Image.Image], max_height: int = STITCH_HEIGHT) -> List[BytesIO]:
         """
-        Stitch images vertically into chunks of max_height
+        Stitch decoded images vertically into chunks of max_height
         Returns list of stitched image buffers
         """
         try:
-            if not image_data_list:
+            if not images:
                 return []
 
-            # Load all images
-            images = []
-            for img_data in image_data_list:
-                img_data.seek(0)
-                img = Image.open(img_data)
-                # Convert to RGB if necessary
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                images.append(img)
-
-            logger.info(f"Loaded {len(images)} images for stitching")
+            logger.info(f"Stitching {len(images)} images")
 
             # Calculate total dimensions
             max_width = max(img.width for img in images)
 
-            # Stitch images into chunks
-            stitched_images = []
+            # Group images into chunks of at most max_height
+            chunks = []
             current_height = 0
             current_images = []
 
             for img in images:
                 if current_height + img.height > max_height and current_images:
-                    # Create stitched image from current batch
-                    stitched = ImageStitcher._create_stitched_image(current_images, max_width, current_height)
-                    stitched_images.append(stitched)
-
-                    # Start new batch
+                    chunks.append((current_images, current_height))
                     current_images = [img]
                     current_height = img.height
                 else:
                     current_images.append(img)
                     current_height += img.height
 
-            # Handle remaining images
             if current_images:
-                stitched = ImageStitcher._create_stitched_image(current_images, max_width, current_height)
-                stitched_images.append(stitched)
+                chunks.append((current_images, current_height))
+
+            # Stitch and encode chunks in parallel
+            stitched_images = list(ImageStitcher._encode_pool.map(
+                lambda chunk: ImageStitcher._create_stitched_image(chunk[0], max_width, chunk[1]),
+                chunks
+            ))
 
             logger.info(f"Created {len(stitched_images)} stitched image(s)")
             return stitched_images
@@ -307,20 +454,48 @@ class ImageStitcher:
     @staticmethod
     def _create_stitched_image(images: List[Image.Image], width: int, height: int) -> BytesIO:
         """Create a single stitched image from a list of images"""
-        # Create new image
-        stitched = Image.new('RGB', (width, height), (255, 255, 255))
-
-        # Paste images
-        y_offset = 0
+        if len(images) == 1 and images[0].width == width:
+            # Nothing to join or pad - encode the page directly
+            buffer = get_buffer()
+            images[0].save(buffer, format='JPEG', quality=STITCH_QUALITY, optimize=True,
+                           progressive=True, subsampling=2)
+            buffer.seek(0)
+            return buffer
+
+        if pyvips is not None:
+            # libvips joins and encodes without materializing the full canvas
+            tiles = [pyvips.Image.new_from_array(np.asarray(img, dtype=np.uint8)) for img in images]
+            joined = pyvips.Image.arrayjoin(tiles, across=1, halign='centre', background=[255, 255, 255])
+            buffer = get_buffer()
+            buffer.write(joined.jpegsave_buffer(Q=STITCH_QUALITY, optimize_coding=True, interlace=True))
+            buffer.seek(0)
+            return buffer
+
+        # Stack image rows directly instead of pasting onto a pre-filled canvas
+        rows = []
         for img in images:
-            # Center image horizontally if it's narrower
-            x_offset = (width - img.width) // 2
-            stitched.paste(img, (x_offset, y_offset))
-            y_offset += img.height
+            arr = np.asarray(img, dtype=np.uint8)
+            if img.width < width:
+                # Center image horizontally if it's narrower (pad with white)
+                left = (width - img.width) // 2
+                right = width - img.width - left
+                arr = np.pad(arr, ((0, 0), (left, right), (0, 0)), constant_values=255)
+            rows.append(arr)
+
+        canvas = np.concatenate(rows, axis=0)
+
+        if _turbojpeg is not None:
+            buffer = get_buffer()
+            buffer.write(_turbojpeg.encode(canvas, quality=STITCH_QUALITY, pixel_format=TJPF_RGB))
+            buffer.seek(0)
+            return buffer
+
+        stitched = Image.fromarray(canvas)
 
         # Save to buffer
-        buffer = BytesIO()
-        stitched.save(buffer, format='JPEG', quality=STITCH_QUALITY, optimize=True)
+        buffer = get_buffer()
+        stitched.save(buffer, format='JPEG', quality=STITCH_QUALITY, optimize=True,
+                      progressive=True, subsampling=2)
         buffer.seek(0)
 
         return buffer
@@ -328,13 +503,42 @@ class ImageStitcher:
 class MangaDownloader:
     """Core downloader functionality"""
 
+    # Chrome cold-start is ~2-3s, so one driver is shared across instances
+    driver = None
+    driver_lock = asyncio.Lock()
+
+    # Dedicated pool for blocking scrapes so a slow Selenium page load
+    # cannot starve the default executor used for Drive/Sheets calls
+    scrape_pool = ThreadPoolExecutor(max_workers=min(os.cpu_count() or 4, 8),
+                                     thread_name_prefix='scrape')
+
     def __init__(self):
         self.session = requests.Session()
+        # Widen the connection pool so parallel CDN fetches reuse TLS sessions
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=64,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Connection': 'keep-alive',
+            # No 'br': neither aiohttp nor urllib3 decodes brotli without
+            # the extra Brotli package
+            'Accept-Encoding': 'gzip'
         }
-        self.driver = None
-        self.driver_lock = asyncio.Lock()
+        self.session_aio = None
+        self._img_sem = asyncio.Semaphore(IMG_CONCURRENCY)
+
+    async def get_aiohttp_session(self) -> aiohttp.ClientSession:
+        """Get or lazily create the shared aiohttp session for image downloads"""
+        if self.session_aio is None or self.session_aio.closed:
+            connector = aiohttp.TCPConnector(limit=64, limit_per_host=16, ttl_dns_cache=300)
+            timeout = aiohttp.ClientTimeout(total=15)
+            self.session_aio = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self.session_aio
 
     def init_selenium(self):
         """Initialize Selenium WebDriver for Replit"""
@@ -346,18 +550,20 @@ class MangaDownloader:
             chrome_options.add_argument("--disable-dev-shm-usage")
             chrome_options.add_argument("--disable-gpu")
             chrome_options.add_argument("--disable-software-rasterizer")
+            # Only img src URLs are needed, not decoded pixels
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
 
             chrome_options.binary_location = "/nix/store/*-chromium-*/bin/chromium"
 
             try:
                 service = Service()
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
+                MangaDownloader.driver = webdriver.Chrome(service=service, options=chrome_options)
                 logger.info("Selenium WebDriver initialized")
             except:
                 from webdriver_manager.chrome import ChromeDriverManager
                 driver_path = ChromeDriverManager().install()
                 service = Service(driver_path)
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
+                MangaDownloader.driver = webdriver.Chrome(service=service, options=chrome_options)
                 logger.info("Selenium WebDriver initialized with webdriver-manager")
 
             return True
@@ -367,30 +573,39 @@ class MangaDownloader:
 
     def close_selenium(self):
         """Close Selenium WebDriver"""
-        if self.driver:
+        if MangaDownloader.driver:
             try:
-                self.driver.quit()
-                self.driver = None
+                MangaDownloader.driver.quit()
+                MangaDownloader.driver = None
             except Exception as e:
                 logger.error(f"Error closing driver: {e}")
 
-    def search_naver(self, query: str) -> List[Dict]:
+    async def _ensure_driver(self) -> bool:
+        """Initialize the shared driver if needed (call with driver_lock held)"""
+        if MangaDownloader.driver:
+            return True
+        return await asyncio.to_thread(self.init_selenium)
+
+    async def search_naver(self, query: str) -> List[Dict]:
         """Search for webtoons on Naver"""
         try:
             search_url = f"https://comic.naver.com/search?keyword={query}"
-            r = self.session.get(search_url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(r.text, 'html.parser')
+            session = await self.get_aiohttp_session()
+            async with session.get(search_url, headers=self.headers,
+                                   timeout=aiohttp.ClientTimeout(total=10)) as r:
+                html = await r.text()
+            tree = HTMLParser(html)
 
             results = []
-            links = soup.find_all('a', href=re.compile(r'titleId=\d+'))
+            links = tree.css('a[href*="titleId="]')
             seen_ids = set()
 
             for link in links[:10]:
-                href = link['href']
-                tid = re.search(r'titleId=(\d+)', href)
+                href = link.attributes.get('href') or ""
+                tid = TITLE_ID_RE.search(href)
                 if tid:
                     tid = tid.group(1)
-                    title = link.get_text(strip=True)
+                    title = link.text(strip=True)
                     if tid not in seen_ids and title:
                         full_link = f"https://comic.naver.com/webtoon/list?titleId={tid}"
                         results.append({
@@ -409,18 +624,18 @@ class MangaDownloader:
     def get_chapter_url(self, site: str, base_url: str, ep_num: int) -> Optional[str]:
         """Build chapter URL based on site"""
         if "Naver" in site:
-            match = re.search(r'titleId=(\d+)', base_url)
+            match = TITLE_ID_RE.search(base_url)
             if match:
                 return f"https://comic.naver.com/webtoon/detail?titleId={match.group(1)}&no={ep_num}"
 
         elif "Webtoons.com" in site:
-            match = re.search(r'title_no=(\d+)', base_url)
+            match = TITLE_NO_RE.search(base_url)
             if match:
                 title_no = match.group(1)
                 return f"https://www.webtoons.com/en/detail/{title_no}/{ep_num}?title_no={title_no}"
 
         elif "LINE" in site:
-            match = re.search(r'product[/?](?:periodic\?id=)?([a-zA-Z0-9]+)', base_url)
+            match = LINE_PRODUCT_RE.search(base_url)
             if match:
                 return f"https://manga.line.me/product/{match.group(1)}/chapter/{ep_num}"
 
@@ -430,20 +645,21 @@ class MangaDownloader:
         """Scrape images using requests"""
         try:
             r = self.session.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(r.text, 'html.parser')
+            tree = HTMLParser(r.text)
             images = []
 
             if "Naver" in site:
-                viewer = soup.find('div', class_='wt_viewer')
+                viewer = tree.css_first('div.wt_viewer')
                 if viewer:
-                    images = [img.get('src') for img in viewer.find_all('img') if img.get('src')]
+                    images = [img.attributes.get('src') for img in viewer.css('img') if img.attributes.get('src')]
 
             elif "LINE" in site:
-                for img in soup.find_all('img'):
-                    src = img.get('data-src') or img.get('src')
-                    if src and ('line-scdn' in src or 'obs.line' in src):
+                seen = set()
+                for img in tree.css('img'):
+                    src = img.attributes.get('data-src') or img.attributes.get('src')
+                    if src and src not in seen and ('line-scdn' in src or 'obs.line' in src):
+                        seen.add(src)
                         images.append(src)
-                images = list(dict.fromkeys(images))
 
             logger.info(f"Scraped {len(images)} images")
             return images
@@ -464,42 +680,59 @@ class MangaDownloader:
                 WebDriverWait(self.driver, 20).until(
                     EC.presence_of_element_located((By.ID, "content-all"))
                 )
-                time.sleep(3)
 
-            total_height = int(self.driver.execute_script("return document.body.scrollHeight"))
-            for i in range(1, total_height, 800):
-                self.driver.execute_script(f"window.scrollTo(0, {i});")
-                time.sleep(0.1)
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
+            # One in-page script triggers lazy loading and returns every img src,
+            # instead of a Python-side scroll loop with per-step sleeps
+            srcs = self.driver.execute_async_script("""
+                const cb = arguments[arguments.length - 1];
+                window.scrollTo(0, document.body.scrollHeight);
+                setTimeout(() => {
+                    cb([...document.images]
+                        .map(i => i.src || i.dataset.src)
+                        .filter(s => s && s.length > 50));
+                }, 1500);
+            """)
 
             images = []
-            img_elements = self.driver.find_elements(By.TAG_NAME, "img")
-
-            for img in img_elements:
-                src = img.get_attribute('src') or img.get_attribute('data-src')
-                if src and len(src) > 50:
-                    if "Webtoons.com" in site and "cdn.webtoon" in src and "stub" not in src:
-                        images.append(src)
-                    elif "Webtoons.com" not in site:
-                        images.append(src)
+            seen = set()
+            for src in srcs or []:
+                if src in seen:
+                    continue
+                if "Webtoons.com" in site and "cdn.webtoon" in src and "stub" not in src:
+                    seen.add(src)
+                    images.append(src)
+                elif "Webtoons.com" not in site:
+                    seen.add(src)
+                    images.append(src)
 
-            images = list(dict.fromkeys(images))
             logger.info(f"Scraped {len(images)} images with Selenium")
             return images
         except Exception as e:
             logger.error(f"Selenium error: {e}")
             return []
 
-    def download_image(self, args) -> Optional[BytesIO]:
-        """Download a single image"""
-        url, referer = args
+    async def _fetch(self, session: aiohttp.ClientSession, url: str, referer: str) -> Optional[Image.Image]:
+        """Download a single image asynchronously and decode it to a PIL Image"""
         try:
             headers = self.headers.copy()
             headers['Referer'] = referer
-            r = self.session.get(url, headers=headers, stream=True, timeout=15)
-            if r.status_code == 200:
-                return BytesIO(r.content)
+            async with self._img_sem:
+                async with session.get(url, headers=headers) as resp:
+                    if resp.status == 200:
+                        # Stream chunks straight into the decode buffer; resp.read()
+                        # would materialize the full bytes and BytesIO would copy them
+                        buf = BytesIO()
+                        async for chunk in resp.content.iter_chunked(64 * 1024):
+                            buf.write(chunk)
+                        buf.seek(0)
+                        img = Image.open(buf)
+                        # Hint libjpeg to emit RGB directly, downscaling oversized
+                        # sources during DCT decode (far cheaper than a resize)
+                        target_w = min(img.width, MAX_SOURCE_WIDTH)
+                        img.draft('RGB', (target_w, int(img.height * target_w / img.width)))
+                        if img.mode != 'RGB':
+                            img = img.convert('RGB')
+                        return img
         except Exception as e:
             logger.error(f"Image download error: {e}")
         return None
@@ -515,11 +748,15 @@ class MangaDownloader:
 
         use_selenium = "Webtoons.com" in site or "AC.QQ" in site
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         if use_selenium:
-            images = await loop.run_in_executor(None, self.scrape_with_selenium, chapter_url, site)
+            # Concurrent chapters queue on the shared driver rather than spawning more
+            async with self.driver_lock:
+                if not await self._ensure_driver():
+                    return None, "Failed to start browser"
+                images = await loop.run_in_executor(self.scrape_pool, self.scrape_with_selenium, chapter_url, site)
         else:
-            images = await loop.run_in_executor(None, self.scrape_with_requests, chapter_url, site)
+            images = await loop.run_in_executor(self.scrape_pool, self.scrape_with_requests, chapter_url, site)
 
         if not images:
             return None, "No images found or chapter locked"
@@ -527,20 +764,21 @@ class MangaDownloader:
         if progress_callback:
             await progress_callback(f"📥 Downloading {len(images)} images...")
 
-        tasks = [(img_url, chapter_url) for img_url in images]
-
-        with ThreadPoolExecutor(max_workers=8) as executor:
-            results = await loop.run_in_executor(None, lambda: list(executor.map(self.download_image, tasks)))
-            image_data = [r for r in results if r is not None]
+        session = await self.get_aiohttp_session()
+        results = await asyncio.gather(
+            *[self._fetch(session, img_url, chapter_url) for img_url in images],
+            return_exceptions=True
+        )
+        decoded_images = [r for r in results if r is not None and not isinstance(r, Exception)]
 
-        if not image_data:
+        if not decoded_images:
             return None, "Failed to download images"
 
         if progress_callback:
-            await progress_callback(f"🧵 Stitching {len(image_data)} images...")
+            await progress_callback(f"🧵 Stitching {len(decoded_images)} images...")
 
         # Stitch images
-        stitched_images = await loop.run_in_executor(None, ImageStitcher.stitch_images, image_data)
+        stitched_images = await asyncio.to_thread(ImageStitcher.stitch_images, decoded_images)
 
         if not stitched_images:
             return None, "Failed to stitch images"
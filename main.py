@@ -1,17 +1,20 @@
 import os
+import re
 import sys
 import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 from scheduler import start_scheduler
-from downloader import MangaDownloader, GoogleDriveUploader, get_skip_value_from_sheet, clean_filename
+from downloader import (MangaDownloader, GoogleDriveUploader, get_skip_value_from_sheet,
+                        clean_filename, STITCH_HEIGHT, STITCH_QUALITY)
+from buffer_pool import put_buffer
 
 try:
     import discord
     from discord.ext import commands
     from discord import app_commands
-    import requests
-    from bs4 import BeautifulSoup
+    import aiohttp
 except ImportError as e:
     print(f"Missing library: {e}")
     sys.exit()
@@ -25,8 +28,6 @@ logger = logging.getLogger(__name__)
 
 # Bot configuration
 BOT_TOKEN = os.environ.get('BOT_TOKEN')
-STITCH_HEIGHT = 12000
-STITCH_QUALITY = 100
 
 # Discord Bot Setup
 intents = discord.Intents.default()
@@ -36,35 +37,104 @@ bot = commands.Bot(command_prefix="!", intents=intents)
 downloader = MangaDownloader()
 drive_uploader = GoogleDriveUploader()
 sheet_scheduler = None  # Will be set when scheduler starts
+http_session = None  # Shared aiohttp session, created in on_ready
+
+SITE_MAP = {
+    "comic.naver.com": "Naver Webtoon",
+    "webtoons.com": "Webtoons.com (Global)",
+    "manga.line.me": "LINE Manga",
+}
+
+def detect_site(url: str):
+    """Map a series URL to its site name, or None if unsupported"""
+    return next((site for domain, site in SITE_MAP.items() if domain in url), None)
+
+_manga_name_cache: Dict[str, str] = {}
+# Only the <title> is needed, so a regex over the raw bytes beats building a DOM
+_TITLE_RE = re.compile(rb'<title[^>]*>([^<]{1,512})</title>', re.I | re.S)
+# Series name is everything before the first '|' or '-' separator
+_TITLE_SPLIT_RE = re.compile(r'\s*([^|\-]+)')
+
+async def fetch_manga_name(url: str, default: str) -> str:
+    """Fetch and cache the series title for a URL without blocking the event loop"""
+    if url in _manga_name_cache:
+        return _manga_name_cache[url]
+    try:
+        async with http_session.get(url, headers=downloader.headers,
+                                    timeout=aiohttp.ClientTimeout(total=5)) as r:
+            match = _TITLE_RE.search(await r.read())
+        if match:
+            title = match.group(1).decode('utf-8', 'ignore')
+            split = _TITLE_SPLIT_RE.match(title)
+            name = clean_filename(split.group(1).strip()) if split else ""
+            if name:
+                _manga_name_cache[url] = name
+                return name
+    except Exception:
+        pass
+    return default
 
 class SearchResultView(discord.ui.View):
-    """View for search results with buttons"""
+    """View for search results with a select menu"""
     def __init__(self, results: List[Dict], timeout=180):
         super().__init__(timeout=timeout)
         self.results = results
 
-        for i, result in enumerate(results[:25]):
-            button = discord.ui.Button(
-                label=result['title'][:80],
-                style=discord.ButtonStyle.primary,
-                custom_id=f"select_{i}"
-            )
-            button.callback = self.create_callback(i)
-            self.add_item(button)
-
-    def create_callback(self, index):
-        async def callback(interaction: discord.Interaction):
-            await interaction.response.edit_message(
-                content=f"✅ Selected: **{self.results[index]['title']}**\n\nURL: `{self.results[index]['url']}`\n\nUse `/download` with this URL!",
-                view=None
-            )
-        return callback
+        self.select = discord.ui.Select(
+            placeholder="Select a result",
+            options=[
+                discord.SelectOption(label=result['title'][:100], value=str(i))
+                for i, result in enumerate(results[:25])
+            ]
+        )
+        self.select.callback = self.on_select
+        self.add_item(self.select)
+
+    async def on_select(self, interaction: discord.Interaction):
+        result = self.results[int(self.select.values[0])]
+        await interaction.response.edit_message(
+            content=f"✅ Selected: **{result['title']}**\n\nURL: `{result['url']}`\n\nUse `/download` with this URL!",
+            view=None
+        )
+
+async def _warmup_drive():
+    """Warm Drive credentials off-thread while the gateway handshake runs"""
+    if not await asyncio.to_thread(drive_uploader.setup_credentials):
+        logger.error("Drive credential warmup failed")
+
+async def setup_hook():
+    # Overlap OAuth refresh + discovery setup with the Discord handshake
+    bot.loop.create_task(_warmup_drive())
+
+bot.setup_hook = setup_hook
+
+_ready_once = False
 
 @bot.event
 async def on_ready():
-    global sheet_scheduler
+    global sheet_scheduler, http_session, _ready_once
     logger.info(f'{bot.user} has connected to Discord!')
-    drive_uploader.setup_credentials()
+    # on_ready fires again on every gateway reconnect; starting another
+    # scheduler task or re-syncing the command tree would leak and rate-limit
+    if _ready_once:
+        return
+    _ready_once = True
+    try:
+        from PIL import __version__ as pil_version, features
+        if features.check_feature('libjpeg_turbo'):
+            logger.info(f"Pillow {pil_version} using libjpeg-turbo")
+        else:
+            logger.warning(f"Pillow {pil_version} built without libjpeg-turbo; JPEG codec will be slower")
+    except Exception:
+        pass
+    if http_session is None:
+        http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=128, limit_per_host=64, ttl_dns_cache=300)
+        )
+    # Size the default executor for the blocking Google API / scrape calls
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=int(os.environ.get('THREAD_POOL_SIZE', '32')))
+    )
     sheet_scheduler = await start_scheduler(bot, downloader, drive_uploader)
     try:
         synced = await bot.tree.sync()
@@ -92,8 +162,8 @@ async def help_command(interaction: discord.Interaction):
     embed.add_field(
         name="📤 Features",
         value=(
-            "✨ Images stitched vertically (max 12000px)\n"
-            "✨ 100% JPEG quality\n"
+            f"✨ Images stitched vertically (max {STITCH_HEIGHT}px)\n"
+            f"✨ {STITCH_QUALITY}% JPEG quality\n"
             "✨ Auto-reads skip value from Google Sheet\n"
             "✨ Uploaded to Google Drive folders"
         ),
@@ -115,7 +185,7 @@ async def sites_command(interaction: discord.Interaction):
 async def search_command(interaction: discord.Interaction, name: str):
     await interaction.response.defer()
 
-    results = await asyncio.get_event_loop().run_in_executor(None, downloader.search_naver, name)
+    results = await downloader.search_naver(name)
 
     if not results:
         await interaction.followup.send("😔 No results found")
@@ -146,13 +216,8 @@ async def download_command(interaction: discord.Interaction, url: str, chapter:
         return
 
     if site == "auto":
-        if "comic.naver.com" in url:
-            site = "Naver Webtoon"
-        elif "webtoons.com" in url:
-            site = "Webtoons.com (Global)"
-        elif "manga.line.me" in url:
-            site = "LINE Manga"
-        else:
+        site = detect_site(url)
+        if not site:
             await interaction.followup.send("❌ Could not detect site")
             return
 
@@ -161,15 +226,7 @@ async def download_command(interaction: discord.Interaction, url: str, chapter:
         skip_value = await get_skip_value_from_sheet(url, sheet_scheduler)
         actual_chapter = chapter + skip_value
 
-        manga_name = "Chapter"
-        try:
-            r = requests.get(url, headers=downloader.headers, timeout=5)
-            soup = BeautifulSoup(r.text, 'html.parser')
-            title_tag = soup.find('title')
-            if title_tag:
-                manga_name = clean_filename(title_tag.text.split('|')[0].split('-')[0].strip())
-        except:
-            pass
+        manga_name = await fetch_manga_name(url, "Chapter")
 
         skip_info = f" (skip: {skip_value}, downloading actual ch: {actual_chapter})" if skip_value > 0 else ""
         status_msg = await interaction.followup.send(
@@ -202,19 +259,22 @@ async def download_command(interaction: discord.Interaction, url: str, chapter:
         # Upload stitched images to folder
         await status_msg.edit(content=f"☁️ Uploading {len(stitched_images)} stitched image(s)...")
 
+        # Use REQUESTED chapter number in filenames (without skip)
+        filenames = [
+            f"{manga_name}_Ch{chapter:03d}_Part{i+1:02d}.jpg"
+            for i in range(len(stitched_images))
+        ]
+        upload_results = await drive_uploader.upload_many(stitched_images, filenames, folder_id)
+
         uploaded_count = 0
         total_size = 0
-
-        for i, img_buffer in enumerate(stitched_images):
-            # Use REQUESTED chapter number in filename (without skip)
-            filename = f"{manga_name}_Ch{chapter:03d}_Part{i+1:02d}.jpg"
-            view_link, file_id = await drive_uploader.upload_file(img_buffer, filename, folder_id, 'image/jpeg')
-
+        for img_buffer, (view_link, file_id) in zip(stitched_images, upload_results):
             if view_link:
                 uploaded_count += 1
-                total_size += len(img_buffer.getvalue())
-
-            await asyncio.sleep(0.5)
+                total_size += img_buffer.getbuffer().nbytes
+            # Recycle the multi-MB buffer as soon as it has been uploaded
+            put_buffer(img_buffer)
+        stitched_images.clear()
 
         # Get folder link
         folder_link = await drive_uploader.get_folder_link(folder_id)
@@ -259,13 +319,8 @@ async def batch_command(interaction: discord.Interaction, url: str, start_chapte
         await interaction.followup.send("❌ Max 10 chapters per batch")
         return
 
-    if "comic.naver.com" in url:
-        site = "Naver Webtoon"
-    elif "webtoons.com" in url:
-        site = "Webtoons.com (Global)"
-    elif "manga.line.me" in url:
-        site = "LINE Manga"
-    else:
+    site = detect_site(url)
+    if not site:
         await interaction.followup.send("❌ Unsupported site")
         return
 
@@ -273,15 +328,7 @@ async def batch_command(interaction: discord.Interaction, url: str, start_chapte
         # Get skip value from Google Sheet
         skip_value = await get_skip_value_from_sheet(url, sheet_scheduler)
 
-        manga_name = "Manga"
-        try:
-            r = requests.get(url, headers=downloader.headers, timeout=5)
-            soup = BeautifulSoup(r.text, 'html.parser')
-            title_tag = soup.find('title')
-            if title_tag:
-                manga_name = clean_filename(title_tag.text.split('|')[0].split('-')[0].strip())
-        except:
-            pass
+        manga_name = await fetch_manga_name(url, "Manga")
 
         skip_info = f" (skip: {skip_value} applied)" if skip_value > 0 else ""
         status_msg = await interaction.followup.send(
@@ -318,19 +365,22 @@ async def batch_command(interaction: discord.Interaction, url: str, start_chapte
 
             await status_msg.edit(content=f"☁️ Uploading Chapter {ch} ({len(stitched_images)} part(s))...")
 
+            # Use DISPLAY chapter number in filenames (without skip)
+            filenames = [
+                f"{manga_name}_Ch{ch:03d}_Part{i+1:02d}.jpg"
+                for i in range(len(stitched_images))
+            ]
+            upload_results = await drive_uploader.upload_many(stitched_images, filenames, chapter_folder_id)
+
             uploaded_count = 0
             total_size = 0
-
-            for i, img_buffer in enumerate(stitched_images):
-                # Use DISPLAY chapter number in filename (without skip)
-                filename = f"{manga_name}_Ch{ch:03d}_Part{i+1:02d}.jpg"
-                view_link, file_id = await drive_uploader.upload_file(img_buffer, filename, chapter_folder_id, 'image/jpeg')
-
+            for img_buffer, (view_link, file_id) in zip(stitched_images, upload_results):
                 if view_link:
                     uploaded_count += 1
-                    total_size += len(img_buffer.getvalue())
-
-                await asyncio.sleep(0.5)
+                    total_size += img_buffer.getbuffer().nbytes
+                # Recycle the buffer now rather than at end-of-batch
+                put_buffer(img_buffer)
+            stitched_images.clear()
 
             if uploaded_count > 0:
                 folder_link = await drive_uploader.get_folder_link(chapter_folder_id)
@@ -352,8 +402,6 @@ async def batch_command(interaction: discord.Interaction, url: str, start_chapte
             else:
                 await interaction.followup.send(f"❌ Failed to upload Chapter {ch}")
 
-            await asyncio.sleep(2)
-
         # Send summary
         if uploaded_chapters:
             main_folder_link = await drive_uploader.get_folder_link(main_folder_id)
@@ -366,10 +414,10 @@ async def batch_command(interaction: discord.Interaction, url: str, start_chapte
                 color=discord.Color.green()
             )
 
-            chapters_text = "\n".join([
+            chapters_text = "\n".join(
                 f"Ch.{item['chapter']}: {item['images']} image(s) - {item['size']/(1024*1024):.1f}MB"
                 for item in uploaded_chapters
-            ])
+            )
 
             embed.add_field(name="📚 Uploaded Chapters", value=chapters_text, inline=False)
             embed.add_field(
@@ -441,9 +489,8 @@ async def test_schedule_command(interaction: discord.Interaction):
     await interaction.response.defer()
 
     try:
-        from scheduler import SheetScheduler
+        from scheduler import SheetScheduler, TIMEZONE
         from datetime import datetime
-        import pytz
 
         scheduler = SheetScheduler(downloader, drive_uploader)
 
@@ -451,7 +498,6 @@ async def test_schedule_command(interaction: discord.Interaction):
             await interaction.followup.send("❌ Failed to setup Sheets credentials")
             return
 
-        TIMEZONE = pytz.timezone('Etc/GMT-2')
         today_name = datetime.now(TIMEZONE).strftime("%A")
 
         await interaction.followup.send(
@@ -474,6 +520,14 @@ if __name__ == "__main__":
         print("Add BOT_TOKEN to Replit Secrets")
         sys.exit()
 
+    # uvloop's libuv-based loop roughly doubles socket I/O throughput
+    try:
+        import uvloop
+        uvloop.install()
+        logger.info("uvloop installed as event loop policy")
+    except ImportError:
+        pass
+
     try:
         bot.run(BOT_TOKEN)
     except Exception as e:
@@ -1,16 +1,31 @@
 import os
 import asyncio
 import logging
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, time, timedelta
-import pytz
+from time import monotonic
+from zoneinfo import ZoneInfo
 from typing import Optional, List, Dict
 from io import BytesIO
 import json
 
+import discord
+
+try:
+    # orjson parses the multi-KB service-account JSON noticeably faster
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 try:
     from google.oauth2 import service_account
     from google.oauth2.credentials import Credentials
     from google.auth.transport.requests import Request
+    import httplib2
+    import google_auth_httplib2
     from googleapiclient.discovery import build
 except ImportError as e:
     print(f"Missing library: {e}")
@@ -22,28 +37,70 @@ SHEET_ID = "1CKbgNt7yMMm3H_s6n3wxKVrDcedyEdZHDjKFUGFLlLU"
 PROGRESS_SHEET = os.environ.get('PROGRESS_SHEET_NAME', 'PROGRESS')
 CONFIG_SHEET = os.environ.get('CONFIG_SHEET_NAME', 'Config')
 SCHEDULE_TIME = time(15, 5)  # 3:05 PM
-TIMEZONE = pytz.timezone('Etc/GMT-2')  # GMT+2
+TIMEZONE = ZoneInfo('Etc/GMT-2')  # GMT+2
+SHEET_CACHE_TTL = 300  # seconds to reuse a sheet range before re-reading
+
+# URL substring -> site name, checked in order
+_SITE_RULES = (
+    ('comic.naver.com', 'Naver Webtoon'),
+    ('webtoons.com', 'Webtoons.com (Global)'),
+    ('manga.line.me', 'LINE Manga'),
+)
 
 
 class SheetScheduler:
     """Handle Google Sheets reading and scheduled downloads"""
 
+    # Built Sheets service shared across instances, so ad-hoc schedulers
+    # (e.g. /list_sheets, /test_schedule) reuse one authorized HTTP
+    # connection pool instead of re-handshaking TLS per instance
+    _sheets_service = None
+    _sheets_credentials = None
+
+    # Bounded pool for the blocking Sheets calls, shared like the service
+    # above, so they neither exhaust threads nor queue behind unrelated
+    # blocking work on the default executor
+    _sheets_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='sheets')
+
+    # httplib2 is not thread-safe; overlapping reads on the shared service
+    # must each run over their own authorized transport
+    _thread_local = threading.local()
+
     def __init__(self, downloader, drive_uploader):
         self.downloader = downloader
         self.drive_uploader = drive_uploader
-        self.sheets_service = None
-        self.credentials = None
+        self.sheets_service = SheetScheduler._sheets_service
+        self.credentials = SheetScheduler._sheets_credentials
+        # (sheet_name, range_spec) -> (monotonic timestamp, rows)
+        self._sheet_cache = {}
+
+    def _thread_http(self):
+        """Per-thread authorized transport; call from the worker thread"""
+        http = getattr(SheetScheduler._thread_local, 'http', None)
+        if http is None:
+            http = google_auth_httplib2.AuthorizedHttp(self.credentials, httplib2.Http())
+            SheetScheduler._thread_local.http = http
+        return http
+
+    def _store_shared_service(self):
+        """Publish the freshly built service for other instances to reuse"""
+        SheetScheduler._sheets_service = self.sheets_service
+        SheetScheduler._sheets_credentials = self.credentials
 
     def setup_sheets_credentials(self):
         """Setup Google Sheets API credentials using Service Account"""
         try:
+            # Already built and still valid - skip the whole setup dance
+            if self.sheets_service and self.credentials and self.credentials.valid:
+                return True
+
             # Try service account first
             service_account_json = os.environ.get('GOOGLE_SERVICE_ACCOUNT_JSON')
 
             if service_account_json:
                 logger.info("Using Service Account for Google Sheets...")
                 try:
-                    service_account_info = json.loads(service_account_json)
+                    service_account_info = _json_loads(service_account_json)
                     SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
 
                     self.credentials = service_account.Credentials.from_service_account_info(
@@ -52,10 +109,11 @@ class SheetScheduler:
                     )
 
                     self.sheets_service = build('sheets', 'v4', credentials=self.credentials)
+                    self._store_shared_service()
                     logger.info("✅ Google Sheets API initialized with Service Account")
                     return True
 
-                except json.JSONDecodeError as e:
+                except ValueError as e:
                     logger.error(f"Invalid JSON in GOOGLE_SERVICE_ACCOUNT_JSON: {e}")
                     logger.error("Make sure you copied the entire JSON content from Google Cloud Console")
                     return False
@@ -75,6 +133,7 @@ class SheetScheduler:
 
                 try:
                     self.sheets_service = build('sheets', 'v4', credentials=self.credentials)
+                    self._store_shared_service()
                     logger.info("✅ Google Sheets API initialized with Drive credentials")
                     return True
                 except Exception as e:
@@ -85,7 +144,7 @@ class SheetScheduler:
 
             if token_str:
                 try:
-                    token_dict = json.loads(token_str)
+                    token_dict = _json_loads(token_str)
                     SCOPES = [
                         'https://www.googleapis.com/auth/spreadsheets.readonly',
                         'https://www.googleapis.com/auth/drive.file'
@@ -96,13 +155,18 @@ class SheetScheduler:
                     logger.error(f"Failed to load sheets token: {e}")
                     return False
 
-            if self.credentials and self.credentials.expired and self.credentials.refresh_token:
-                logger.info("Refreshing sheets token...")
-                try:
-                    self.credentials.refresh(Request())
-                except Exception as e:
-                    logger.error(f"Failed to refresh token: {e}")
-                    return False
+            if self.credentials and self.credentials.refresh_token:
+                # Refresh when expired or about to expire; a valid token needs
+                # no round trip to Google's token endpoint
+                expiry = self.credentials.expiry
+                near_expiry = expiry and expiry - datetime.utcnow() < timedelta(minutes=5)
+                if self.credentials.expired or near_expiry:
+                    logger.info("Refreshing sheets token...")
+                    try:
+                        self.credentials.refresh(Request())
+                    except Exception as e:
+                        logger.error(f"Failed to refresh token: {e}")
+                        return False
 
             if not self.credentials or not self.credentials.valid:
                 logger.error("="*60)
@@ -125,6 +189,7 @@ class SheetScheduler:
                 return False
 
             self.sheets_service = build('sheets', 'v4', credentials=self.credentials)
+            self._store_shared_service()
             logger.info("✅ Google Sheets API initialized with OAuth")
             return True
 
@@ -142,11 +207,14 @@ class SheetScheduler:
                     return None
 
             loop = asyncio.get_event_loop()
+            # Only the titles are needed; the mask drops the rest of the
+            # per-sheet metadata from the response
             sheet_metadata = await loop.run_in_executor(
-                None,
+                self._sheets_pool,
                 lambda: self.sheets_service.spreadsheets().get(
-                    spreadsheetId=SHEET_ID
-                ).execute()
+                    spreadsheetId=SHEET_ID,
+                    fields='sheets.properties.title'
+                ).execute(http=self._thread_http())
             )
 
             sheets = sheet_metadata.get('sheets', [])
@@ -164,51 +232,47 @@ class SheetScheduler:
                 if not self.setup_sheets_credentials():
                     return None
 
+            cache_key = (sheet_name, range_spec)
+            cached = self._sheet_cache.get(cache_key)
+            if cached and monotonic() - cached[0] < SHEET_CACHE_TTL:
+                return cached[1]
+
             full_range = f"{sheet_name}!{range_spec}"
 
             loop = asyncio.get_event_loop()
 
-            # First get the values
-            result = await loop.run_in_executor(
-                None,
-                lambda: self.sheets_service.spreadsheets().values().get(
-                    spreadsheetId=SHEET_ID,
-                    range=full_range
-                ).execute()
-            )
-            values = result.get('values', [])
-
-            # Then get the cell data with formulas to extract hyperlinks
+            # A single grid read returns values and hyperlinks together;
+            # the fields mask strips everything else from the response
             sheet_data = await loop.run_in_executor(
-                None,
+                self._sheets_pool,
                 lambda: self.sheets_service.spreadsheets().get(
                     spreadsheetId=SHEET_ID,
                     ranges=[full_range],
-                    includeGridData=True
-                ).execute()
+                    includeGridData=True,
+                    fields='sheets.data.rowData.values(formattedValue,hyperlink)'
+                ).execute(http=self._thread_http())
             )
 
-            # Extract hyperlinks from cell data
-            hyperlinks = {}
+            # Build rows directly, preferring the hyperlink over display text
+            values = []
+            hyperlink_count = 0
             sheets = sheet_data.get('sheets', [])
-            if sheets:
-                grid_data = sheets[0].get('data', [])
-                if grid_data:
-                    row_data = grid_data[0].get('rowData', [])
-                    for row_idx, row in enumerate(row_data):
-                        cell_data = row.get('values', [])
-                        for col_idx, cell in enumerate(cell_data):
-                            hyperlink = cell.get('hyperlink')
-                            if hyperlink:
-                                hyperlinks[(row_idx, col_idx)] = hyperlink
-
-            # Replace display text with actual URLs where hyperlinks exist
-            for row_idx, row in enumerate(values):
-                for col_idx, cell in enumerate(row):
-                    if (row_idx, col_idx) in hyperlinks:
-                        values[row_idx][col_idx] = hyperlinks[(row_idx, col_idx)]
-
-            logger.info(f"Read {len(values)} rows from {sheet_name} (with {len(hyperlinks)} hyperlinks)")
+            grid_data = sheets[0].get('data', []) if sheets else []
+            if grid_data:
+                for row in grid_data[0].get('rowData', []):
+                    row_values = []
+                    for cell in row.get('values', []):
+                        hyperlink = cell.get('hyperlink')
+                        if hyperlink:
+                            hyperlink_count += 1
+                            row_values.append(hyperlink)
+                        else:
+                            row_values.append(cell.get('formattedValue', ''))
+                    values.append(row_values)
+
+            self._sheet_cache[cache_key] = (monotonic(), values)
+
+            logger.info("Read %d rows from %s (with %d hyperlinks)", len(values), sheet_name, hyperlink_count)
             return values
 
         except Exception as e:
@@ -236,60 +300,65 @@ class SheetScheduler:
             today_name = datetime.now(TIMEZONE).strftime("%A")
             logger.info(f"Checking for tasks scheduled for: {today_name}")
 
+            today_lower = today_name.casefold()
+
             tasks = []
-            # Skip header row (index 0)
+            # Skip header row (index 0); rows are padded to 13 columns once
+            # so the per-cell length guards disappear from the loop body
             for row_idx, row in enumerate(progress_data[1:], start=2):
                 # Ensure row has enough columns
                 if len(row) < 11:
                     continue
+                if len(row) < 13:
+                    row = row + [''] * (13 - len(row))
 
-                # Column K (index 10) contains the day name
-                scheduled_day = row[10].strip() if len(row) > 10 and row[10] else ""
-
-                # Case-insensitive comparison
-                if scheduled_day.lower() == today_name.lower():
-                    # Column A (index 0) = Title
-                    # Column B (index 1) = URL
-                    # Column D (index 3) = Last chapter number
-                    # Column M (index 12) = Skip chapters value
-                    url = row[1].strip() if len(row) > 1 and row[1] else ""
-                    last_chapter_str = row[3].strip() if len(row) > 3 and row[3] else "0"
-                    title = row[0].strip() if len(row) > 0 and row[0] else "Unknown"
-                    skip_chapters_str = row[12].strip() if len(row) > 12 and row[12] else "0"
+                # Column K (index 10) contains the day name (case-insensitive)
+                if (row[10] or '').strip().casefold() != today_lower:
+                    continue
 
-                    try:
-                        last_chapter = int(last_chapter_str)
-                        skip_chapters = int(skip_chapters_str) if skip_chapters_str else 0
+                # Column A (index 0) = Title
+                # Column B (index 1) = URL
+                # Column D (index 3) = Last chapter number
+                # Column M (index 12) = Skip chapters value
+                url = (row[1] or '').strip()
+                title = (row[0] or '').strip() or "Unknown"
+                last_chapter_str = (row[3] or '').strip() or "0"
+                skip_chapters_str = (row[12] or '').strip() or "0"
 
-                        # Calculate next chapter: (last_chapter + 1) + skip_chapters
-                        next_chapter = last_chapter + 1 + skip_chapters
+                try:
+                    last_chapter = int(last_chapter_str)
+                    skip_chapters = int(skip_chapters_str)
+
+                    # Calculate next chapter: (last_chapter + 1) + skip_chapters
+                    next_chapter = last_chapter + 1 + skip_chapters
+
+                    # %-style so the per-row messages are only formatted
+                    # when INFO is actually enabled
+                    logger.info(
+                        "Task calculation: %s - Last chapter: %d, Skip: %d, "
+                        "Next chapter to download: %d",
+                        title, last_chapter, skip_chapters, next_chapter
+                    )
+                except ValueError as e:
+                    logger.warning(
+                        "Invalid number in row %d: last_chapter='%s', skip='%s' - %s",
+                        row_idx, last_chapter_str, skip_chapters_str, e
+                    )
+                    continue
 
-                        logger.info(
-                            f"Task calculation: {title} - "
-                            f"Last chapter: {last_chapter}, "
-                            f"Skip: {skip_chapters}, "
-                            f"Next chapter to download: {next_chapter}"
-                        )
-                    except ValueError as e:
-                        logger.warning(
-                            f"Invalid number in row {row_idx}: "
-                            f"last_chapter='{last_chapter_str}', skip='{skip_chapters_str}' - {e}"
-                        )
-                        continue
-
-                    if url:
-                        tasks.append({
-                            'row_number': row_idx,
-                            'title': title,
-                            'url': url,
-                            'chapter': next_chapter,
-                            'last_chapter': last_chapter,
-                            'skip_chapters': skip_chapters
-                        })
-                        logger.info(
-                            f"Found task: {title} - "
-                            f"Chapter {next_chapter} (Row {row_idx}, Skip: {skip_chapters})"
-                        )
+                if url:
+                    tasks.append({
+                        'row_number': row_idx,
+                        'title': title,
+                        'url': url,
+                        'chapter': next_chapter,
+                        'last_chapter': last_chapter,
+                        'skip_chapters': skip_chapters
+                    })
+                    logger.info(
+                        "Found task: %s - Chapter %d (Row %d, Skip: %d)",
+                        title, next_chapter, row_idx, skip_chapters
+                    )
 
             logger.info(f"Found {len(tasks)} task(s) for today")
             return tasks
@@ -345,13 +414,8 @@ class SheetScheduler:
             )
 
             # Detect site
-            if "comic.naver.com" in url:
-                site = "Naver Webtoon"
-            elif "webtoons.com" in url:
-                site = "Webtoons.com (Global)"
-            elif "manga.line.me" in url:
-                site = "LINE Manga"
-            else:
+            site = next((name for pattern, name in _SITE_RULES if pattern in url), None)
+            if site is None:
                 logger.error(f"Unsupported site for URL: {url}")
                 return {
                     'success': False,
@@ -371,11 +435,6 @@ class SheetScheduler:
                     'task': task
                 }
 
-            # Import clean_filename function
-            import re
-            def clean_filename(name):
-                return re.sub(r'[\\/*?:"<>|]', "", name).strip()
-
             # Create chapter folder using DISPLAY chapter number (without skip)
             folder_name = f"Ch{display_chapter:03d}"
             chapter_folder_id = await self.drive_uploader.create_folder(folder_name, destination_folder_id)
@@ -388,25 +447,19 @@ class SheetScheduler:
                     'task': task
                 }
 
-            # Upload images
+            # Upload images concurrently
             logger.info(f"Uploading {len(stitched_images)} stitched image(s)")
+            filenames = [f"Page{i+1:02d}.jpg" for i in range(len(stitched_images))]
+            upload_results = await self.drive_uploader.upload_many(
+                stitched_images, filenames, chapter_folder_id, concurrency=5
+            )
+
             uploaded_count = 0
             total_size = 0
-
-            for i, img_buffer in enumerate(stitched_images):
-                filename = f"Page{i+1:02d}.jpg"
-                view_link, file_id = await self.drive_uploader.upload_file(
-                    img_buffer, 
-                    filename, 
-                    chapter_folder_id, 
-                    'image/jpeg'
-                )
-
+            for img_buffer, (view_link, file_id) in zip(stitched_images, upload_results):
                 if view_link:
                     uploaded_count += 1
-                    total_size += len(img_buffer.getvalue())
-
-                await asyncio.sleep(0.5)
+                    total_size += img_buffer.getbuffer().nbytes
 
             if uploaded_count == 0:
                 return {
@@ -459,57 +512,79 @@ class SheetScheduler:
                     f"🔄 Starting automated downloads: {len(tasks)} chapter(s) scheduled for today"
                 )
 
-            results = []
+            # One Config read covers every task's destination lookup
+            config_data = await self.read_sheet_data(CONFIG_SHEET, "A:C")
+            folder_map = {}
+            if config_data:
+                for row_number, row in enumerate(config_data, start=1):
+                    if len(row) > 2 and row[2] and row[2].strip():
+                        folder_map[row_number] = row[2].strip()
 
-            for task in tasks:
-                # Get destination folder
-                destination_folder = await self.get_destination_folder(task['row_number'])
+            # Tasks are network-bound and independent, so overlap them
+            sem = asyncio.Semaphore(int(os.environ.get('TASK_CONCURRENCY', '4')))
 
-                if not destination_folder:
-                    logger.warning(f"No destination folder for {task['title']}, using default")
-                    destination_folder = os.environ.get('GOOGLE_DRIVE_FOLDER_ID', '')
+            async def run_task(task):
+                async with sem:
+                    # Small jitter so simultaneous starts don't burst the APIs
+                    await asyncio.sleep(random.uniform(0, 1))
 
-                if not destination_folder:
-                    logger.error(f"No destination folder available for {task['title']}")
-                    if notification_channel:
-                        await notification_channel.send(
-                            f"❌ {task['title']} Ch.{task['chapter']}: No destination folder"
-                        )
-                    continue
+                    # Get destination folder
+                    destination_folder = folder_map.get(task['row_number'])
 
-                # Download and upload
-                result = await self.download_and_upload_chapter(task, destination_folder)
-                results.append(result)
+                    if not destination_folder:
+                        logger.warning(f"No destination folder for {task['title']}, using default")
+                        destination_folder = os.environ.get('GOOGLE_DRIVE_FOLDER_ID', '')
 
-                # Send notification
-                if notification_channel:
-                    if result['success']:
-                        skip_info = f" (skipped {task['skip_chapters']})" if task.get('skip_chapters', 0) > 0 else ""
-                        await notification_channel.send(
-                            f"✅ **{task['title']}** - Chapter {task['chapter']}{skip_info}\n"
-                            f"📁 {result['uploaded_count']} image(s) - {result['total_size']/(1024*1024):.2f}MB\n"
-                            f"🔗 [Open Folder]({result['folder_link']})"
-                        )
-                    else:
-                        await notification_channel.send(
-                            f"❌ **{task['title']}** - Chapter {task['chapter']}\n"
-                            f"Error: {result.get('error', 'Unknown error')}"
-                        )
+                    if not destination_folder:
+                        logger.error(f"No destination folder available for {task['title']}")
+                        return {
+                            'success': False,
+                            'error': 'No destination folder',
+                            'task': task
+                        }
+
+                    # Download and upload
+                    return await self.download_and_upload_chapter(task, destination_folder)
 
-                # Wait between downloads
-                await asyncio.sleep(5)
+            gathered = await asyncio.gather(*[run_task(t) for t in tasks], return_exceptions=True)
+
+            results = []
+            for item in gathered:
+                if isinstance(item, Exception):
+                    logger.error(f"Task crashed: {item}")
+                elif item is not None:
+                    results.append(item)
 
             # Summary
             successful = sum(1 for r in results if r['success'])
             failed = len(results) - successful
 
+            # One embed per run instead of a message per task keeps us well
+            # clear of Discord's per-channel rate limit
             if notification_channel:
-                await notification_channel.send(
-                    f"📊 **Daily Download Summary**\n"
-                    f"✅ Successful: {successful}\n"
-                    f"❌ Failed: {failed}\n"
-                    f"📅 Total: {len(results)}"
+                lines = []
+                for r in results:
+                    task = r['task']
+                    if r['success']:
+                        skip_info = f" (skipped {task['skip_chapters']})" if task.get('skip_chapters', 0) > 0 else ""
+                        lines.append(
+                            f"✅ **{task['title']}** Ch.{task['chapter']}{skip_info} - "
+                            f"{r['uploaded_count']} image(s), {r['total_size']/(1024*1024):.2f}MB - "
+                            f"[Open Folder]({r['folder_link']})"
+                        )
+                    else:
+                        lines.append(
+                            f"❌ **{task['title']}** Ch.{task['chapter']} - "
+                            f"{r.get('error', 'Unknown error')}"
+                        )
+
+                embed = discord.Embed(
+                    title="📊 Daily Download Summary",
+                    description="\n".join(lines)[:4096],
+                    color=discord.Color.green() if failed == 0 else discord.Color.orange()
                 )
+                embed.set_footer(text=f"✅ {successful} successful · ❌ {failed} failed · 📅 {len(results)} total")
+                await notification_channel.send(embed=embed)
 
             logger.info(f"Daily task processing complete: {successful}/{len(results)} successful")
 
@@ -537,25 +612,24 @@ class SheetScheduler:
             except:
                 logger.warning("Could not get notification channel")
 
+        # Build the schedule datetime once and roll it forward by whole days
+        # after each run, instead of rebuilding it every iteration.
+        # Etc/GMT-2 is a fixed-offset zone, so day arithmetic is safe
+        next_run = datetime.combine(
+            datetime.now(TIMEZONE).date(), SCHEDULE_TIME, tzinfo=TIMEZONE
+        )
+
         while not bot.is_closed():
             try:
                 now = datetime.now(TIMEZONE)
-                scheduled_time = TIMEZONE.localize(
-                    datetime.combine(now.date(), SCHEDULE_TIME)
-                )
 
-                # If scheduled time has passed today, schedule for tomorrow
-                if now >= scheduled_time:
-                    scheduled_time = TIMEZONE.localize(
-                        datetime.combine(
-                            (now + timedelta(days=1)).date(),
-                            SCHEDULE_TIME
-                        )
-                    )
+                # Catch up if we fell more than a day behind (e.g. long outage)
+                while now >= next_run:
+                    next_run += timedelta(days=1)
 
                 # Calculate wait time
-                wait_seconds = (scheduled_time - now).total_seconds()
-                logger.info(f"Next scheduled run: {scheduled_time} (in {wait_seconds/3600:.1f} hours)")
+                wait_seconds = (next_run - now).total_seconds()
+                logger.info(f"Next scheduled run: {next_run} (in {wait_seconds/3600:.1f} hours)")
 
                 # Wait until scheduled time
                 await asyncio.sleep(wait_seconds)